@@ -0,0 +1,13 @@
+-- CreateFunction
+-- Wake workers LISTENing on jobs_<type> as soon as a job is enqueued
+CREATE OR REPLACE FUNCTION "notify_job_inserted"() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('jobs_' || NEW."type", NEW."id");
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- CreateTrigger
+CREATE TRIGGER "jobs_notify_inserted"
+AFTER INSERT ON "jobs"
+FOR EACH ROW EXECUTE FUNCTION "notify_job_inserted"();
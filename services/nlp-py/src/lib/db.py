@@ -1,60 +1,88 @@
-"""Utility helpers for PostgreSQL connection pooling via psycopg2."""
+"""Utility helpers for PostgreSQL connection pooling via asyncpg."""
 
+import asyncio
+import json
 import os
-from contextlib import contextmanager
-from typing import Any, Generator
+from collections.abc import AsyncGenerator, Coroutine
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
 
-import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+import asyncpg
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
 
-# Optional: auto-load .env for local dev if python-dotenv is available
-try:
-    from pathlib import Path
-    from dotenv import load_dotenv  # type: ignore
-
-    def _try_load_env() -> None:
-        # Search for a .env file starting from CWD and walking up a few levels
-        candidates: list[Path] = []
-        try:
-            here = Path(__file__).resolve()
-            # Walk up to repo root (heuristic up to 6 levels)
-            for p in [Path.cwd(), *here.parents[:6]]:
-                candidates.append(p / ".env")
-        except Exception:
-            candidates.append(Path.cwd() / ".env")
-
-        for env_path in candidates:
-            if env_path.exists():
-                load_dotenv(env_path)
-                break
-
-    _try_load_env()
-except Exception:
-    # If python-dotenv is not installed or any error occurs, skip silently
-    pass
+# Optional: auto-load .env for local dev if python-dotenv is available.
+# Deployed workers already have DATABASE_URL in the environment, so they skip
+# both the dotenv import and the filesystem walk.
+if not os.environ.get("DATABASE_URL"):
+    try:
+        from pathlib import Path
+        from dotenv import load_dotenv  # type: ignore
+
+        def _try_load_env() -> None:
+            # Search for a .env file starting from CWD and walking up a few levels
+            candidates: list[Path] = []
+            try:
+                here = Path(__file__).resolve()
+                # Walk up to repo root (heuristic up to 6 levels)
+                for p in [Path.cwd(), *here.parents[:6]]:
+                    candidates.append(p / ".env")
+            except Exception:
+                candidates.append(Path.cwd() / ".env")
+
+            for env_path in candidates:
+                if env_path.exists():
+                    load_dotenv(env_path)
+                    break
+
+        _try_load_env()
+    except Exception:
+        # If python-dotenv is not installed or any error occurs, skip silently
+        pass
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
-# Connection pool instance
-_connection_pool: pool.SimpleConnectionPool | None = None
+T = TypeVar("T")
+
+# Connection pool instance and the event loop it is bound to
+_connection_pool: asyncpg.Pool | None = None
+_pool_loop: asyncio.AbstractEventLoop | None = None
+
+# Connection held by the enclosing get_cursor() block of the current task, if any
+_current_connection: ContextVar[asyncpg.Connection | None] = ContextVar(
+    "_current_connection", default=None
+)
 
 DEFAULT_MIN_CONN = int(os.environ.get("DB_POOL_MIN", "1"))
 DEFAULT_MAX_CONN = int(os.environ.get("DB_POOL_MAX", "5"))
 DEFAULT_CONN_TIMEOUT = int(os.environ.get("DB_CONN_TIMEOUT", "5"))
+DEFAULT_COMMAND_TIMEOUT = int(os.environ.get("DB_COMMAND_TIMEOUT", "60"))
+# Prepared statements cached per connection (set to 0 behind pgbouncer transaction pooling)
+DEFAULT_STATEMENT_CACHE_SIZE = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "256"))
 
 
-def initialize_pool(
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Decode json/jsonb columns into Python objects (psycopg2 did this implicitly)."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+
+
+async def initialize_pool(
     minconn: int | None = None,
     maxconn: int | None = None,
     database_url: str | None = None,
     connect_timeout: int | None = None,
+    command_timeout: int | None = None,
 ) -> None:
     """Initialize the PostgreSQL connection pool lazily."""
-    global _connection_pool
+    global _connection_pool, _pool_loop
 
     if _connection_pool is not None:
         logger.warning("Connection pool already initialized")
@@ -67,54 +95,63 @@ def initialize_pool(
     min_size = minconn or DEFAULT_MIN_CONN
     max_size = maxconn or DEFAULT_MAX_CONN
     timeout = connect_timeout or DEFAULT_CONN_TIMEOUT
+    query_timeout = command_timeout or DEFAULT_COMMAND_TIMEOUT
 
     if min_size > max_size:
         raise ValueError("minconn cannot be larger than maxconn")
 
-    # Normalize Prisma-style URL (strip unsupported `schema` param for psycopg2)
+    # Normalize Prisma-style URL (asyncpg would forward `schema` as a server setting)
     def _normalize_db_url(url: str) -> tuple[str, str | None]:
         parsed = urlparse(url)
         params = dict(parse_qsl(parsed.query, keep_blank_values=True))
         schema = params.pop("schema", None)
         new_query = urlencode(params, doseq=True)
         normalized = urlunparse(parsed._replace(query=new_query))
-        options_val = f"-c search_path={schema}" if schema else None
-        return normalized, options_val
+        return normalized, schema
 
-    normalized_url, options_val = _normalize_db_url(db_url)
+    normalized_url, schema = _normalize_db_url(db_url)
 
     logger.info(
         "Initializing connection pool",
         minconn=min_size,
         maxconn=max_size,
         timeout=timeout,
+        command_timeout=query_timeout,
+        statement_cache_size=DEFAULT_STATEMENT_CACHE_SIZE,
     )
 
-    extra_kwargs: dict[str, Any] = {"connect_timeout": timeout}
+    extra_kwargs: dict[str, Any] = {
+        "timeout": timeout,
+        "command_timeout": query_timeout,
+        "statement_cache_size": DEFAULT_STATEMENT_CACHE_SIZE,
+        "init": _init_connection,
+    }
     sslmode = os.environ.get("DB_SSL_MODE")
     if sslmode:
-        extra_kwargs["sslmode"] = sslmode
-    if options_val:
-        extra_kwargs["options"] = options_val
+        extra_kwargs["ssl"] = sslmode
+    if schema:
+        extra_kwargs["server_settings"] = {"search_path": schema}
 
-    _connection_pool = psycopg2.pool.SimpleConnectionPool(
-        min_size,
-        max_size,
+    _connection_pool = await asyncpg.create_pool(
         normalized_url,
+        min_size=min_size,
+        max_size=max_size,
         **extra_kwargs,
     )
+    _pool_loop = asyncio.get_running_loop()
 
 
-def close_pool() -> None:
+async def close_pool() -> None:
     """
     Close all connections in the pool
     """
-    global _connection_pool
+    global _connection_pool, _pool_loop
 
     if _connection_pool is not None:
         logger.info("Closing connection pool")
-        _connection_pool.closeall()
+        await _connection_pool.close()
         _connection_pool = None
+        _pool_loop = None
 
 
 def get_pool_status() -> dict[str, int] | None:
@@ -123,49 +160,58 @@ def get_pool_status() -> dict[str, int] | None:
     if _connection_pool is None:
         return None
 
+    idle = _connection_pool.get_idle_size()
     return {
-        "minconn": _connection_pool.minconn,
-        "maxconn": _connection_pool.maxconn,
-        "used": _connection_pool._used,  # type: ignore[attr-defined]
-        "available": len(_connection_pool._pool),  # type: ignore[attr-defined]
+        "minconn": _connection_pool.get_min_size(),
+        "maxconn": _connection_pool.get_max_size(),
+        "used": _connection_pool.get_size() - idle,
+        "available": idle,
     }
 
 
-@contextmanager
-def get_connection() -> Generator[Any, None, None]:
+@asynccontextmanager
+async def get_connection() -> AsyncGenerator[asyncpg.Connection, None]:
     """
     Get a connection from the pool
-    Returns a context manager that automatically returns the connection to the pool
+    Returns a context manager that automatically returns the connection to the pool.
+    Inside a get_cursor() block the block's connection (and transaction) is reused
+    instead of checking out a second one
     """
+    current = _current_connection.get()
+    if current is not None:
+        yield current
+        return
+
     if _connection_pool is None:
         raise RuntimeError("Connection pool not initialized. Call initialize_pool() first.")
 
-    conn = _connection_pool.getconn()
-    try:
+    async with _connection_pool.acquire() as conn:
         yield conn
-    finally:
-        _connection_pool.putconn(conn)
 
 
-@contextmanager
-def get_cursor(cursor_factory=RealDictCursor) -> Generator[Any, None, None]:
+@asynccontextmanager
+async def get_cursor() -> AsyncGenerator[asyncpg.Connection, None]:
     """
-    Get a cursor from the pool
-    Returns a context manager that automatically commits and closes the cursor
+    Get a connection wrapped in a transaction
+    asyncpg has no separate cursor object; the transaction commits on success
+    and rolls back if the block raises. Do not fan out concurrent tasks inside
+    the block: they would share this single connection
     """
-    with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=cursor_factory)
+    async with get_connection() as conn, conn.transaction():
+        token = _current_connection.set(conn)
         try:
-            yield cursor
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
+            yield conn
         finally:
-            cursor.close()
+            _current_connection.reset(token)
+
 
+def _parse_rowcount(status: str) -> int:
+    """Extract the affected row count from a command tag such as 'UPDATE 3'."""
+    count = status.rsplit(" ", 1)[-1]
+    return int(count) if count.isdigit() else 0
 
-def execute_query(
+
+async def execute_query(
     query: str,
     params: tuple | None = None,
     fetch_one: bool = False,
@@ -173,15 +219,13 @@ def execute_query(
     """
     Execute a query and return results
     """
-    with get_cursor() as cursor:
-        cursor.execute(query, params)
-
+    async with get_connection() as conn:
         if fetch_one:
-            return cursor.fetchone()
-        return cursor.fetchall()
+            return await conn.fetchrow(query, *(params or ()))
+        return await conn.fetch(query, *(params or ()))
 
 
-def execute_update(
+async def execute_update(
     query: str,
     params: tuple | None = None,
 ) -> int:
@@ -189,22 +233,65 @@ def execute_update(
     Execute an UPDATE/INSERT/DELETE query
     Returns the number of affected rows
     """
-    with get_cursor() as cursor:
-        cursor.execute(query, params)
-        return cursor.rowcount
+    async with get_connection() as conn:
+        status = await conn.execute(query, *(params or ()))
+        return _parse_rowcount(status)
 
 
-def health_check() -> bool:
+async def health_check() -> bool:
     """Run a lightweight health check against the database."""
 
     try:
-        result = execute_query("SELECT 1", fetch_one=True)
+        result = await execute_query("SELECT 1", fetch_one=True)
         return bool(result)
     except Exception as exc:  # pragma: no cover - used for ops visibility
         logger.error("Database health check failed", error=str(exc))
         return False
 
 
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a database coroutine from synchronous code
+    Reuses the loop that owns the pool: blocks on it directly when idle, or
+    hands the coroutine over when that loop is running in another thread
+    """
+    global _pool_loop
+
+    if _pool_loop is None:
+        _pool_loop = asyncio.new_event_loop()
+
+    if not _pool_loop.is_running():
+        return _pool_loop.run_until_complete(coro)
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is _pool_loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the pool's event loop; await instead")
+
+    return asyncio.run_coroutine_threadsafe(coro, _pool_loop).result()
+
+
+def execute_query_sync(
+    query: str,
+    params: tuple | None = None,
+    fetch_one: bool = False,
+) -> Any:
+    """Synchronous shim around execute_query()."""
+    return run_sync(execute_query(query, params, fetch_one))
+
+
+def execute_update_sync(
+    query: str,
+    params: tuple | None = None,
+) -> int:
+    """Synchronous shim around execute_update()."""
+    return run_sync(execute_update(query, params))
+
+
 __all__ = [
     "initialize_pool",
     "close_pool",
@@ -212,6 +299,9 @@ __all__ = [
     "get_cursor",
     "execute_query",
     "execute_update",
+    "execute_query_sync",
+    "execute_update_sync",
+    "run_sync",
     "health_check",
     "get_pool_status",
 ]
@@ -3,17 +3,23 @@ Base Job Processor
 Abstract class for processing jobs from the queue
 """
 
-import json
-import time
+import asyncio
+import os
+import random
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import timedelta
 from typing import Any
 
-from .db import execute_query, execute_update, get_cursor, initialize_pool
+import asyncpg
+
+from .db import close_pool, execute_query, execute_update, get_connection, initialize_pool
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("JOB_MAX_CONCURRENCY", "4"))
+MAX_BACKOFF_MINUTES = 60
+
 
 class JobProcessor(ABC):
     """
@@ -21,20 +27,29 @@ class JobProcessor(ABC):
     Subclasses must implement process_job method
     """
 
-    def __init__(self, job_type: str, poll_interval: int = 5):
+    def __init__(
+        self,
+        job_type: str,
+        poll_interval: int = 5,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
         """
         Initialize the job processor
 
         Args:
             job_type: Type of jobs this processor handles
-            poll_interval: Seconds between polling for new jobs
+            poll_interval: Max seconds to wait for a job notification before polling again
+            max_concurrency: Max jobs claimed and run concurrently (keep below DB_POOL_MAX)
         """
         self.job_type = job_type
         self.poll_interval = poll_interval
+        self.max_concurrency = max_concurrency
         self.running = False
+        # Set by the jobs_<type> NOTIFY issued from the jobs insert trigger
+        self._wakeup = asyncio.Event()
 
     @abstractmethod
-    def process_job(self, payload: dict[str, Any]) -> dict[str, Any]:
+    async def process_job(self, payload: dict[str, Any]) -> dict[str, Any]:
         """
         Process a single job
         Must be implemented by subclasses
@@ -54,24 +69,59 @@ class JobProcessor(ABC):
         logger.info(f"Starting job processor for type: {self.job_type}")
         self.running = True
 
-        # Initialize database pool
-        initialize_pool()
-
         try:
-            while self.running:
-                job = self._dequeue_job()
-
-                if job:
-                    self._execute_job(job)
-                else:
-                    # No jobs available, sleep for a bit
-                    time.sleep(self.poll_interval)
-
+            asyncio.run(self._run())
         except KeyboardInterrupt:
             logger.info("Job processor interrupted by user")
         finally:
             self.stop()
 
+    async def _run(self) -> None:
+        """
+        Process jobs until stopped, sleeping on LISTEN between empty polls
+        """
+        # Initialize database pool
+        await initialize_pool()
+
+        channel = f"jobs_{self.job_type}"
+
+        try:
+            # Hold one connection for the lifetime of the worker to receive notifications
+            async with get_connection() as listen_conn:
+                await listen_conn.add_listener(channel, self._on_notify)
+                try:
+                    while self.running:
+                        # Clear before polling so a NOTIFY racing the dequeue is not lost
+                        self._wakeup.clear()
+                        jobs = await self._dequeue_batch(self.max_concurrency)
+
+                        if jobs:
+                            # Overlap the jobs' DB round-trips on the shared pool
+                            await asyncio.gather(*(self._execute_job(job) for job in jobs))
+                        else:
+                            # No jobs available, wait for an insert notification.
+                            # The timeout still picks up retries scheduled for later.
+                            await self._wait_for_jobs()
+                finally:
+                    await listen_conn.remove_listener(channel, self._on_notify)
+        finally:
+            await close_pool()
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        """
+        asyncpg listener callback: wake the main loop
+        """
+        self._wakeup.set()
+
+    async def _wait_for_jobs(self) -> None:
+        """
+        Block until a job notification arrives or poll_interval elapses
+        """
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except TimeoutError:
+            pass
+
     def stop(self) -> None:
         """
         Stop the job processor
@@ -79,46 +129,41 @@ class JobProcessor(ABC):
         logger.info(f"Stopping job processor for type: {self.job_type}")
         self.running = False
 
-    def _dequeue_job(self) -> dict[str, Any] | None:
+    async def _dequeue_batch(self, limit: int) -> list[asyncpg.Record]:
         """
-        Dequeue the next pending job of the specified type
+        Atomically claim up to `limit` pending jobs of the specified type
         """
         query = """
         UPDATE jobs
         SET status = 'processing',
-            started_at = %s,
+            started_at = NOW(),
             attempts = attempts + 1,
-            updated_at = %s
-        WHERE id = (
+            updated_at = NOW()
+        WHERE id IN (
             SELECT id
             FROM jobs
-            WHERE type = %s
+            WHERE type = $1
             AND status = 'pending'
-            AND scheduled_for <= %s
+            AND scheduled_for <= NOW()
             ORDER BY scheduled_for ASC
-            LIMIT 1
+            LIMIT $2
             FOR UPDATE SKIP LOCKED
         )
         RETURNING id, type, payload, attempts, max_attempts
         """
 
-        now = datetime.now()
-        result = execute_query(
-            query,
-            (now, now, self.job_type, now),
-            fetch_one=True,
-        )
+        jobs = await execute_query(query, (self.job_type, limit))
 
-        if result:
+        for job in jobs:
             logger.info(
                 "Dequeued job",
-                job_id=result["id"],
-                attempt=result["attempts"],
+                job_id=job["id"],
+                attempt=job["attempts"],
             )
 
-        return result
+        return jobs
 
-    def _execute_job(self, job: dict[str, Any]) -> None:
+    async def _execute_job(self, job: asyncpg.Record) -> None:
         """
         Execute a single job
         """
@@ -127,10 +172,10 @@ class JobProcessor(ABC):
 
         try:
             logger.info(f"Processing job {job_id}")
-            result = self.process_job(payload)
+            result = await self.process_job(payload)
 
             # Mark job as completed
-            self._complete_job(job_id, result)
+            await self._complete_job(job_id, result)
 
         except Exception as e:
             logger.error(
@@ -140,30 +185,26 @@ class JobProcessor(ABC):
             )
 
             # Mark job as failed (will retry if attempts < max_attempts)
-            self._fail_job(job_id, job["attempts"], job["max_attempts"], str(e))
+            await self._fail_job(job_id, job["attempts"], job["max_attempts"], str(e))
 
-    def _complete_job(self, job_id: str, result: dict[str, Any]) -> None:
+    async def _complete_job(self, job_id: str, result: dict[str, Any]) -> None:
         """
         Mark a job as completed
         """
         query = """
         UPDATE jobs
         SET status = 'completed',
-            result = %s,
-            completed_at = %s,
-            updated_at = %s
-        WHERE id = %s
+            result = $1,
+            completed_at = NOW(),
+            updated_at = NOW()
+        WHERE id = $2
         """
 
-        now = datetime.now()
-        execute_update(
-            query,
-            (json.dumps(result), now, now, job_id),
-        )
+        await execute_update(query, (result, job_id))
 
         logger.info(f"Job {job_id} completed successfully")
 
-    def _fail_job(
+    async def _fail_job(
         self,
         job_id: str,
         attempts: int,
@@ -177,30 +218,24 @@ class JobProcessor(ABC):
         should_retry = attempts < max_attempts
 
         if should_retry:
-            # Exponential backoff: 1min, 2min, 4min, ...
-            backoff_minutes = 2 ** (attempts - 1)
-            scheduled_for = datetime.now()
-            scheduled_for = scheduled_for.replace(
-                minute=scheduled_for.minute + backoff_minutes
-            )
+            # Exponential backoff: 1min, 2min, 4min, ... capped, with ±20% jitter
+            # so jobs that failed together do not all retry at the same moment
+            backoff_minutes = min(2 ** (attempts - 1), MAX_BACKOFF_MINUTES)
+            backoff = timedelta(minutes=backoff_minutes * random.uniform(0.8, 1.2))
 
             query = """
             UPDATE jobs
             SET status = 'pending',
-                scheduled_for = %s,
-                error_message = %s,
-                updated_at = %s
-            WHERE id = %s
+                scheduled_for = NOW() + $1::interval,
+                error_message = $2,
+                updated_at = NOW()
+            WHERE id = $3
             """
 
-            now = datetime.now()
-            execute_update(
-                query,
-                (scheduled_for, error, now, job_id),
-            )
+            await execute_update(query, (backoff, error, job_id))
 
             logger.warning(
-                f"Job {job_id} will retry in {backoff_minutes} minutes",
+                f"Job {job_id} will retry in ~{backoff_minutes} minutes",
                 attempt=attempts,
                 max_attempts=max_attempts,
             )
@@ -208,17 +243,13 @@ class JobProcessor(ABC):
             query = """
             UPDATE jobs
             SET status = 'failed',
-                error_message = %s,
-                completed_at = %s,
-                updated_at = %s
-            WHERE id = %s
+                error_message = $1,
+                completed_at = NOW(),
+                updated_at = NOW()
+            WHERE id = $2
             """
 
-            now = datetime.now()
-            execute_update(
-                query,
-                (error, now, now, job_id),
-            )
+            await execute_update(query, (error, job_id))
 
             logger.error(
                 f"Job {job_id} failed permanently",
@@ -3,16 +3,26 @@ Structured Logger using structlog
 Supports correlation IDs, log levels, and JSON output
 """
 
+import functools
 import logging
 import sys
 from typing import Any
 
+import orjson
 import structlog
 
 # Determine if in development mode
 is_development = sys.stderr.isatty()
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """
+    JSONRenderer serializer backed by orjson
+    orjson returns bytes; the stdlib logger factory expects str
+    """
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
 def setup_logging(level: str = "INFO") -> None:
     """
     Setup structlog with appropriate processors and renderers
@@ -25,7 +35,9 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
     # Shared processors
+    # filter_by_level runs first so disabled (e.g. DEBUG) calls skip the rest of the chain
     shared_processors = [
+        structlog.stdlib.filter_by_level,
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
@@ -42,8 +54,7 @@ def setup_logging(level: str = "INFO") -> None:
         # Production: JSON output
         processors = shared_processors + [
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps),
         ]
 
     # Configure structlog
@@ -56,6 +67,7 @@ def setup_logging(level: str = "INFO") -> None:
     )
 
 
+@functools.lru_cache(maxsize=128)
 def get_logger(name: str = __name__) -> structlog.stdlib.BoundLogger:
     """
     Get a logger instance with the given name
@@ -67,7 +79,7 @@ def with_correlation_id(correlation_id: str) -> structlog.stdlib.BoundLogger:
     """
     Get a logger with correlation ID bound to context
     """
-    return structlog.get_logger().bind(correlation_id=correlation_id)
+    return _ROOT_LOGGER.bind(correlation_id=correlation_id)
 
 
 def log_with_context(
@@ -78,8 +90,7 @@ def log_with_context(
     """
     Log a message with additional context
     """
-    logger = structlog.get_logger()
-    log_method = getattr(logger, level.lower())
+    log_method = getattr(_ROOT_LOGGER, level.lower())
     log_method(message, **context)
 
 
@@ -96,8 +107,7 @@ def log_warn(message: str, **context: Any) -> None:
 
 def log_error(message: str, exc_info: bool = False, **context: Any) -> None:
     """Log error level message"""
-    logger = structlog.get_logger()
-    logger.error(message, exc_info=exc_info, **context)
+    _ROOT_LOGGER.error(message, exc_info=exc_info, **context)
 
 
 def log_debug(message: str, **context: Any) -> None:
@@ -107,3 +117,6 @@ def log_debug(message: str, **context: Any) -> None:
 
 # Initialize logging on module import
 setup_logging()
+
+# Shared by the helpers above instead of a structlog.get_logger() lookup per message
+_ROOT_LOGGER = structlog.get_logger()
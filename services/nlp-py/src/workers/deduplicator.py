@@ -3,45 +3,68 @@ Article Deduplication using MinHash and SimHash
 Implements clustering of similar articles to reduce redundancy
 """
 
-import hashlib
+import asyncio
+import functools
+import os
 import uuid
 import re
+import threading
+import time
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import aclosing
 from typing import Any
 
-from datasketch import MinHash, MinHashLSH
-
-from ..lib.db import execute_query, execute_update, get_cursor
-from ..lib.job_processor import JobProcessor
+import asyncpg
+import numpy as np
+import xxhash
+from datasketch import LeanMinHash, MinHash, MinHashLSH
+
+# Optional: JIT-compile the SimHash kernel when numba is installed (`jit` extra)
+try:
+    from numba import njit  # type: ignore
+except ImportError:
+    _HAVE_NUMBA = False
+else:
+    _HAVE_NUMBA = True
+
+from ..lib.db import execute_query, execute_update, get_connection
+from ..lib.job_processor import DEFAULT_MAX_CONCURRENCY, JobProcessor
 from ..lib.logger import get_logger
 
 logger = get_logger(__name__)
 
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"\w+")
 
-def normalize_text(text: str) -> str:
-    """
-    Normalize text for similarity comparison
-    """
-    # Lowercase
-    text = text.lower()
+# Fixed basename so every worker process shares the same Redis-backed LSH tables
+LSH_REDIS_BASENAME = b"morning-pulse:dedup-lsh"
 
-    # Remove URLs
-    text = re.sub(r"https?://\S+", "", text)
+# Articles pulled per cursor round-trip and hashed together
+FETCH_BATCH_SIZE = int(os.environ.get("DEDUP_FETCH_BATCH_SIZE", "256"))
 
-    # Remove special characters but keep spaces
-    text = re.sub(r"[^\w\s]", " ", text)
+# Seconds between passes that drop clusters older than the 48h window from the LSH
+LSH_EVICTION_INTERVAL = int(os.environ.get("DEDUP_LSH_EVICTION_INTERVAL", "600"))
 
-    # Remove extra whitespace
-    text = re.sub(r"\s+", " ", text).strip()
 
-    return text
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for similarity comparison
+    """
+    # Lowercase and drop URLs, then keep the word runs separated by single spaces;
+    # same result as replacing punctuation with spaces and collapsing whitespace
+    return " ".join(_WORD_RE.findall(_URL_RE.sub("", text.lower())))
 
 
-def tokenize(text: str) -> list[str]:
+# Pure, so memoized: repeated texts (syndicated copies, compute_simhash + compute_minhash
+# on the same input) tokenize once. maxsize bounds the memory across jobs
+@functools.lru_cache(maxsize=4096)
+def tokenize(text: str) -> tuple[str, ...]:
     """
     Tokenize text into words for MinHash
+    Same tokens as normalize_text(text).split(), found in a single regex pass
+    Returns a tuple so the cached result cannot be mutated by callers
     """
-    normalized = normalize_text(text)
-    return normalized.split()
+    return tuple(_WORD_RE.findall(_URL_RE.sub("", text.lower())))
 
 
 def compute_simhash(text: str, num_bits: int = 64) -> str:
@@ -49,46 +72,148 @@ def compute_simhash(text: str, num_bits: int = 64) -> str:
     Compute SimHash for text similarity detection
     Returns hex string representation
     """
-    tokens = tokenize(text)
-    if not tokens:
-        return "0" * (num_bits // 4)  # Return zero hash for empty text
+    return simhash_from_tokens(tokenize(text), num_bits)
+
+
+def simhash_from_tokens(tokens: Sequence[str], num_bits: int = 64) -> str:
+    """
+    Compute SimHash from already tokenized text
+    """
+    return batch_simhash_from_tokens([tokens], num_bits)[0]
+
+
+def batch_simhash_from_tokens(
+    token_lists: Sequence[Sequence[str]], num_bits: int = 64
+) -> list[str]:
+    """
+    Compute SimHashes for many tokenized texts at once
+    All token hashes go into one flat array with per-text lengths, so the bit
+    counting runs once over the whole batch instead of once per text
+    """
+    if num_bits % 8 or not 0 < num_bits <= 64:
+        raise ValueError("num_bits must be a multiple of 8 between 8 and 64")
 
-    # Initialize bit vector
-    vector = [0] * num_bits
+    lengths = np.fromiter(
+        (len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists)
+    )
 
-    # Hash each token and update bit vector
-    for token in tokens:
-        token_hash = int(hashlib.md5(token.encode()).hexdigest(), 16)
+    # Only dispersion matters here; XXH3 is the cheapest 64-bit hash on short inputs like tokens
+    hashes = np.fromiter(
+        (xxhash.xxh3_64_intdigest(token.encode()) for tokens in token_lists for token in tokens),
+        dtype=np.uint64,
+        count=int(lengths.sum()),
+    )
 
+    if _simhash_kernel is not None:
+        fingerprints = _simhash_kernel(hashes, lengths, num_bits)
+    else:
+        fingerprints = _simhash_numpy(hashes, lengths, num_bits)
+
+    # Texts without tokens come out as the zero hash
+    return [format(int(fingerprint), f"0{num_bits // 4}x") for fingerprint in fingerprints]
+
+
+def _simhash_numpy(hashes: np.ndarray, lengths: np.ndarray, num_bits: int) -> np.ndarray:
+    """
+    Fingerprints from flat token hashes using vectorized NumPy bit counting
+    """
+    # One row of bits per token; little-endian bytes + bit order put hash bit i in column i
+    # (astype is a no-op view on little-endian hosts)
+    bits = np.unpackbits(hashes.astype("<u8", copy=False).view(np.uint8), bitorder="little")
+    bits = bits.reshape(-1, 64)[:, :num_bits]
+
+    # Per-text column sums; reduceat cannot express empty segments, so those rows stay zero
+    # (int32 counts are plenty for any article and sum faster than int64)
+    ones = np.zeros((len(lengths), num_bits), dtype=np.int32)
+    nonempty = lengths > 0
+    if nonempty.any():
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        ones[nonempty] = np.add.reduceat(bits, starts, axis=0, dtype=np.int32)
+
+    # A fingerprint bit is set when more tokens have it set than unset
+    fingerprint_bits = (2 * ones > lengths[:, None]).astype(np.uint8)
+
+    # Pack each row back into little-endian bytes, padded out to a full uint64
+    packed = np.zeros((len(lengths), 8), dtype=np.uint8)
+    packed[:, : num_bits // 8] = np.packbits(fingerprint_bits, axis=1, bitorder="little")
+    return packed.view("<u8").ravel()
+
+
+def _simhash_loop(hashes: np.ndarray, lengths: np.ndarray, num_bits: int) -> np.ndarray:
+    """
+    Fingerprints from flat token hashes as a plain loop, for numba to compile
+    Hash operands stay uint64 so numba does not promote the shifts to float;
+    the per-bit counts are int64
+    """
+    one = np.uint64(1)
+    fingerprints = np.zeros(lengths.size, dtype=np.uint64)
+    ones = np.zeros(num_bits, dtype=np.int64)
+
+    start = 0
+    for n in range(lengths.size):
+        # Count set bits per position without branching; the sign is derived at the end
+        ones[:] = 0
+        for k in range(start, start + lengths[n]):
+            token_hash = hashes[k]
+            for i in range(num_bits):
+                ones[i] += (token_hash >> np.uint64(i)) & one
+        start += lengths[n]
+
+        # Set when more tokens have the bit set than unset (vector[i] = 2 * ones - n > 0)
+        fingerprint = np.uint64(0)
         for i in range(num_bits):
-            if token_hash & (1 << i):
-                vector[i] += 1
-            else:
-                vector[i] -= 1
+            if 2 * ones[i] > lengths[n]:
+                fingerprint |= one << np.uint64(i)
+        fingerprints[n] = fingerprint
+
+    return fingerprints
 
-    # Convert to binary fingerprint
-    fingerprint = 0
-    for i in range(num_bits):
-        if vector[i] > 0:
-            fingerprint |= 1 << i
 
-    # Convert to hex string
-    return format(fingerprint, f"0{num_bits // 4}x")
+_simhash_kernel = njit(cache=True)(_simhash_loop) if _HAVE_NUMBA else None
 
 
 def compute_minhash(text: str, num_perm: int = 128) -> MinHash:
     """
     Compute MinHash for Jaccard similarity estimation
     """
-    minhash = MinHash(num_perm=num_perm)
-    tokens = tokenize(text)
+    return minhash_from_tokens(tokenize(text), num_perm)
 
-    for token in tokens:
-        minhash.update(token.encode("utf-8"))
+
+@functools.cache
+def _minhash_permutations(num_perm: int) -> Any:
+    """
+    Permutation parameters shared by every MinHash of the given size
+    Generated once from the default seed instead of per MinHash; never mutated
+    """
+    return MinHash(num_perm=num_perm).permutations
+
+
+def minhash_from_tokens(tokens: Sequence[str], num_perm: int = 128) -> MinHash:
+    """
+    Compute MinHash from already tokenized text
+    """
+    minhash = MinHash(num_perm=num_perm, permutations=_minhash_permutations(num_perm))
+    # One vectorized pass over all permutations instead of one update() per token
+    minhash.update_batch([token.encode("utf-8") for token in tokens])
 
     return minhash
 
 
+def batch_minhash_from_tokens(
+    token_lists: Sequence[Sequence[str]], num_perm: int = 128
+) -> list[MinHash]:
+    """
+    Compute MinHashes for many tokenized texts at once
+    MinHash.bulk sets up one initial state and copies it for every text
+    """
+    minhashes: list[MinHash] = MinHash.bulk(
+        ([token.encode("utf-8") for token in tokens] for tokens in token_lists),
+        num_perm=num_perm,
+        permutations=_minhash_permutations(num_perm),
+    )
+    return minhashes
+
+
 def hamming_distance(hash1: str, hash2: str) -> int:
     """
     Calculate Hamming distance between two hex hashes
@@ -96,12 +221,40 @@ def hamming_distance(hash1: str, hash2: str) -> int:
     if len(hash1) != len(hash2):
         raise ValueError("Hashes must be same length")
 
-    # Convert hex to binary
-    bin1 = bin(int(hash1, 16))[2:].zfill(len(hash1) * 4)
-    bin2 = bin(int(hash2, 16))[2:].zfill(len(hash2) * 4)
+    # Differing bits are the set bits of the XOR (int.bit_count maps to POPCNT)
+    return (int(hash1, 16) ^ int(hash2, 16)).bit_count()
+
+
+def hamming_distances(hash1: str, hashes: list[str]) -> np.ndarray:
+    """
+    Calculate Hamming distances from one hex hash (up to 64 bits) to many at once
+    """
+    if len(hash1) > 16:
+        raise ValueError("Hashes must be at most 64 bits")
+    if any(len(other) != len(hash1) for other in hashes):
+        raise ValueError("Hashes must be same length")
+
+    target = np.uint64(int(hash1, 16))
+    others = np.fromiter((int(other, 16) for other in hashes), dtype=np.uint64, count=len(hashes))
 
-    # Count differing bits
-    return sum(b1 != b2 for b1, b2 in zip(bin1, bin2))
+    # XOR + per-element popcount over the whole array
+    return np.asarray(np.bitwise_count(others ^ target), dtype=np.uint8)
+
+
+def _lsh_storage_config() -> dict[str, Any] | None:
+    """
+    Keep the LSH index in Redis when REDIS_HOST is set (requires the redis extra),
+    otherwise in process memory
+    """
+    host = os.environ.get("REDIS_HOST")
+    if not host:
+        return None
+
+    return {
+        "type": "redis",
+        "basename": LSH_REDIS_BASENAME,
+        "redis": {"host": host, "port": int(os.environ.get("REDIS_PORT", "6379"))},
+    }
 
 
 class DeduplicationWorker(JobProcessor):
@@ -109,13 +262,26 @@ class DeduplicationWorker(JobProcessor):
     Worker for deduplicating articles using MinHash LSH
     """
 
-    def __init__(self, poll_interval: int = 5):
-        super().__init__("deduplication", poll_interval)
-        self.lsh: MinHashLSH | None = None
+    def __init__(self, poll_interval: int = 5, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        super().__init__("deduplication", poll_interval, max_concurrency)
         # Spec requires ≥0.85 similarity threshold within 48h window
         self.similarity_threshold = 0.85  # Jaccard similarity threshold
-
-    def process_job(self, payload: dict[str, Any]) -> dict[str, Any]:
+        # Built once so articles are matched against clusters from earlier jobs too.
+        # Only clusters already committed to the DB are inserted, so a concurrent job
+        # (or another worker sharing the Redis index) never matches an unwritten cluster
+        self.lsh = MinHashLSH(
+            threshold=self.similarity_threshold,
+            num_perm=128,
+            storage_config=_lsh_storage_config(),
+        )
+        # Jobs touch the index from worker threads concurrently; neither the in-memory
+        # tables nor the Redis client's shared pipeline buffers are thread-safe
+        self._lsh_lock = threading.Lock()
+        self._last_eviction: float | None = None
+        # Pay the numba compile (or cache load) now rather than inside the first job
+        simhash_from_tokens(["warmup"])
+
+    async def process_job(self, payload: dict[str, Any]) -> dict[str, Any]:
         """
         Process deduplication job for a batch of articles
         """
@@ -129,163 +295,262 @@ class DeduplicationWorker(JobProcessor):
             article_count=len(article_ids),
         )
 
-        # Initialize LSH index
-        self.lsh = MinHashLSH(
-            threshold=self.similarity_threshold,
-            num_perm=128,
-        )
+        await self._evict_expired_clusters()
+
+        # Process articles a fetch batch at a time as they stream in; DB writes are
+        # collected and flushed once at the end
+        assignments: list[tuple[str, str, str]] = []  # (article_id, simhash, cluster_id)
+        new_clusters: list[tuple[str, str]] = []  # (cluster_id, rep_article_id)
+        touched_clusters: set[str] = set()
+        # Clusters created by this job are only visible to this job until they are saved
+        staging = MinHashLSH(threshold=self.similarity_threshold, num_perm=128)
+        staged_minhashes: dict[str, LeanMinHash] = {}
+
+        # aclosing ends the cursor's transaction promptly if clustering raises mid-stream
+        async with aclosing(self._iter_article_batches(article_ids)) as batches:
+            async for articles in batches:
+                # Hashing is CPU-bound and the Redis-backed index uses a blocking client,
+                # so keep both off the event loop shared with the other running jobs
+                await asyncio.to_thread(
+                    self._cluster_articles,
+                    articles,
+                    staging,
+                    staged_minhashes,
+                    assignments,
+                    new_clusters,
+                    touched_clusters,
+                )
 
-        # Fetch articles
-        articles = self._fetch_articles(article_ids)
+        await self._save_assignments(assignments, new_clusters)
 
-        # Process each article
-        clusters_created = 0
-        articles_clustered = 0
+        # The clusters exist in the DB now; let later jobs match them
+        await asyncio.to_thread(self._publish_clusters, staged_minhashes)
 
-        for article in articles:
-            # Compute hashes
-            text = f"{article['title']} {article['summary_raw'] or ''}"
-            simhash = compute_simhash(text)
-            minhash = compute_minhash(text)
+        # Recompute representative article based on longest content and highest trust score
+        await self._recompute_representatives(touched_clusters)
 
-            # Update article with simhash
-            self._update_article_simhash(article["id"], simhash)
+        return {
+            "articles_processed": len(assignments),
+            "articles_clustered": len(assignments) - len(new_clusters),
+            "clusters_created": len(new_clusters),
+        }
 
-            # Check for similar articles using LSH
-            similar = self.lsh.query(minhash)
+    def _cluster_articles(
+        self,
+        articles: list[asyncpg.Record],
+        staging: MinHashLSH,
+        staged_minhashes: dict[str, LeanMinHash],
+        assignments: list[tuple[str, str, str]],
+        new_clusters: list[tuple[str, str]],
+        touched_clusters: set[str],
+    ) -> None:
+        """
+        Assign each article to a similar existing cluster or a new one, recording
+        the results in the given collections
+        New clusters go into the job's staging index, not the shared one
+        """
+        # Tokenize once for both hashes, then hash the whole batch in one pass each
+        token_lists = [
+            tokenize(f"{title} {summary_raw or ''}") for _, title, summary_raw in articles
+        ]
+        simhashes = batch_simhash_from_tokens(token_lists)
+        minhashes = batch_minhash_from_tokens(token_lists)
+
+        for (article_id, _, _), simhash, minhash in zip(articles, simhashes, minhashes):
+            # Check for similar articles using LSH: committed clusters, then this job's
+            with self._lsh_lock:
+                similar = self.lsh.query(minhash)
+            similar = similar or staging.query(minhash)
 
             if similar:
                 # Found similar article(s), add to existing cluster
                 cluster_id = similar[0]  # Use first match's cluster
-                self._assign_to_cluster(article["id"], cluster_id)
-                articles_clustered += 1
+                touched_clusters.add(cluster_id)
 
-                logger.info(
-                    f"Article {article['id']} assigned to cluster {cluster_id}",
-                    article_id=article["id"],
+                logger.debug(
+                    f"Article {article_id} assigned to cluster {cluster_id}",
+                    article_id=article_id,
                     cluster_id=cluster_id,
                 )
             else:
-                # No similar articles, create new cluster
-                cluster_id = self._create_cluster(article["id"])
-                self.lsh.insert(cluster_id, minhash)
-                clusters_created += 1
-
-                logger.info(
-                    f"Created new cluster {cluster_id} for article {article['id']}",
-                    article_id=article["id"],
+                # No similar articles, create new cluster with the article as representative
+                # Generate a string ID since Prisma schema uses String @id (cuid-like)
+                cluster_id = str(uuid.uuid4())
+                new_clusters.append((cluster_id, article_id))
+                staged_minhashes[cluster_id] = LeanMinHash(minhash)
+                staging.insert(cluster_id, staged_minhashes[cluster_id])
+
+                logger.debug(
+                    f"Created new cluster {cluster_id} for article {article_id}",
+                    article_id=article_id,
                     cluster_id=cluster_id,
                 )
 
-        return {
-            "articles_processed": len(articles),
-            "articles_clustered": articles_clustered,
-            "clusters_created": clusters_created,
-        }
+            assignments.append((article_id, simhash, cluster_id))
 
-    def _fetch_articles(self, article_ids: list[str]) -> list[dict[str, Any]]:
+    def _publish_clusters(self, minhashes: dict[str, LeanMinHash]) -> None:
+        """
+        Insert saved clusters into the shared LSH index
+        One insertion session buffers the writes (a single pipeline with Redis)
         """
-        Fetch articles from database (limited to last 48 hours per spec)
+        with self._lsh_lock, self.lsh.insertion_session() as session:
+            for cluster_id, minhash in minhashes.items():
+                # Fresh UUIDs, so skip the per-key duplicate lookup
+                session.insert(cluster_id, minhash, check_duplication=False)
+
+    async def _iter_article_batches(
+        self, article_ids: list[str]
+    ) -> AsyncGenerator[list[asyncpg.Record], None]:
         """
-        placeholders = ",".join(["%s"] * len(article_ids))
-        query = f"""
-        SELECT id, title, summary_raw, ts_published, source_id
+        Stream articles from database in batches of FETCH_BATCH_SIZE
+        (limited to last 48 hours per spec)
+        """
+        # A single array parameter keeps one statement shape for every batch size
+        query = """
+        SELECT id, title, summary_raw
         FROM articles
-        WHERE id IN ({placeholders})
+        WHERE id = ANY($1::text[])
           AND ts_published >= NOW() - INTERVAL '48 hours'
         ORDER BY ts_published DESC
         """
 
-        return execute_query(query, tuple(article_ids))
+        # asyncpg cursors only live inside a transaction; rows are pulled on demand
+        # so a large job never holds the full result set in memory
+        async with get_connection() as conn, conn.transaction():
+            cursor = await conn.cursor(query, list(article_ids))
+            while articles := await cursor.fetch(FETCH_BATCH_SIZE):
+                yield articles
 
-    def _update_article_simhash(self, article_id: str, simhash: str) -> None:
+    async def _evict_expired_clusters(self) -> None:
         """
-        Update article with computed SimHash
+        Remove clusters that left the 48h dedup window from the LSH index
+        Runs at most every LSH_EVICTION_INTERVAL seconds, and each pass after the first
+        only looks at clusters that expired since the previous one
         """
+        now = time.monotonic()
+        lookback: float | None
+        if self._last_eviction is None:
+            # A Redis-backed index can hold clusters from any earlier run, so the first
+            # pass has no lower bound
+            lookback = None
+        elif now - self._last_eviction < LSH_EVICTION_INTERVAL:
+            return
+        else:
+            # Overlap the previous pass so nothing slips through between the two
+            lookback = now - self._last_eviction + LSH_EVICTION_INTERVAL
+        self._last_eviction = now
+
+        # updated_at moves forward whenever an article joins the cluster
         query = """
-        UPDATE articles
-        SET simhash = %s, updated_at = NOW()
-        WHERE id = %s
+        SELECT id
+        FROM clusters
+        WHERE updated_at < NOW() - INTERVAL '48 hours'
+          AND ($1::float8 IS NULL
+               OR updated_at >= NOW() - INTERVAL '48 hours' - make_interval(secs => $1))
         """
 
-        execute_update(query, (simhash, article_id))
+        rows = await execute_query(query, (lookback,))
 
-    def _create_cluster(self, article_id: str) -> str:
-        """
-        Create a new cluster with the article as representative
+        # Blocking calls with the Redis-backed index (thousands on the first pass after
+        # startup), so they run off the event loop
+        evicted = await asyncio.to_thread(
+            self._remove_clusters, [cluster_id for (cluster_id,) in rows]
+        )
+
+        if evicted:
+            logger.info(f"Evicted {evicted} expired clusters from LSH index", evicted=evicted)
+
+    def _remove_clusters(self, cluster_ids: list[str]) -> int:
         """
-        query = """
-        INSERT INTO clusters (id, rep_article_id, created_at, updated_at)
-        VALUES (%s, %s, NOW(), NOW())
-        RETURNING id
+        Remove clusters from the shared LSH index, skipping ones that are not in it
+        Returns the number removed
         """
-
-        with get_cursor() as cursor:
-            # Generate a string ID since Prisma schema uses String @id (cuid-like)
-            cluster_id = str(uuid.uuid4())
-            cursor.execute(query, (cluster_id, article_id))
-            result = cursor.fetchone()
-            # Prefer DB-returned id in case of DB-side defaults (should match inserted value)
-            cluster_id = result["id"] if result and result.get("id") else cluster_id
-
-            # Assign article to cluster within the same transaction/connection
-            update_article_query = """
-            UPDATE articles
-            SET cluster_id = %s, updated_at = NOW()
-            WHERE id = %s
-            """
-            cursor.execute(update_article_query, (cluster_id, article_id))
-
-            return cluster_id
-
-    def _assign_to_cluster(self, article_id: str, cluster_id: str) -> None:
+        removed = 0
+        for cluster_id in cluster_ids:
+            # remove() checks membership itself and raises ValueError for a missing key:
+            # an earlier pass or another worker sharing the index may have removed it,
+            # even between a separate `in` check and the remove
+            # Locked per key so a long first pass does not stall clustering in other jobs
+            try:
+                with self._lsh_lock:
+                    self.lsh.remove(cluster_id)
+            except ValueError:
+                continue
+            removed += 1
+
+        return removed
+
+    async def _save_assignments(
+        self,
+        assignments: list[tuple[str, str, str]],
+        new_clusters: list[tuple[str, str]],
+    ) -> None:
         """
-        Assign article to an existing cluster
+        Create new clusters and write simhash + cluster_id for every article
+        A writable CTE does both in a single statement (one round-trip)
         """
+        if not assignments:
+            return
+
+        # The CTE runs even though the UPDATE does not read it; the articles -> clusters
+        # foreign key is checked at the end of the statement, after both have run
         query = """
-        UPDATE articles
-        SET cluster_id = %s, updated_at = NOW()
-        WHERE id = %s
+        WITH new_clusters AS (
+            INSERT INTO clusters (id, rep_article_id, created_at, updated_at)
+            SELECT c.id, c.rep_article_id, NOW(), NOW()
+            FROM unnest($4::text[], $5::text[]) AS c(id, rep_article_id)
+        )
+        UPDATE articles AS a
+        SET simhash = v.simhash, cluster_id = v.cluster_id, updated_at = NOW()
+        FROM unnest($1::text[], $2::text[], $3::text[]) AS v(id, simhash, cluster_id)
+        WHERE a.id = v.id
         """
 
-        execute_update(query, (cluster_id, article_id))
+        article_ids, simhashes, cluster_ids = (list(col) for col in zip(*assignments))
+        new_cluster_ids = [cluster_id for cluster_id, _ in new_clusters]
+        rep_article_ids = [article_id for _, article_id in new_clusters]
 
-        # Recompute representative article based on longest content and highest trust score
-        self._recompute_representative(cluster_id)
+        await execute_update(
+            query,
+            (article_ids, simhashes, cluster_ids, new_cluster_ids, rep_article_ids),
+        )
 
-    def _recompute_representative(self, cluster_id: str) -> None:
+    async def _recompute_representatives(self, cluster_ids: set[str]) -> None:
         """
-        Recompute the representative article for the cluster using:
+        Recompute the representative article for each cluster using:
         - Longest content (content length, fallback to summary_raw, then title)
         - Highest source trust score as tiebreaker
         - Most recent publish time as final tiebreaker
         """
-        select_query = """
-        SELECT a.id
-        FROM articles a
-        LEFT JOIN sources s ON s.id = a.source_id
-        WHERE a.cluster_id = %s
-        ORDER BY
-          COALESCE(LENGTH(a.content), LENGTH(a.summary_raw), LENGTH(a.title), 0) DESC,
-          COALESCE(s.trust_score, 0) DESC,
-          a.ts_published DESC
-        LIMIT 1
+        if not cluster_ids:
+            return
+
+        # Rank every touched cluster's articles in one pass and keep each cluster's top row;
+        # clusters with no articles are left untouched
+        query = """
+        WITH ranked AS (
+            SELECT
+              a.cluster_id,
+              a.id,
+              ROW_NUMBER() OVER (
+                PARTITION BY a.cluster_id
+                ORDER BY
+                  COALESCE(LENGTH(a.content), LENGTH(a.summary_raw), LENGTH(a.title), 0) DESC,
+                  COALESCE(s.trust_score, 0) DESC,
+                  a.ts_published DESC
+              ) AS rn
+            FROM articles a
+            LEFT JOIN sources s ON s.id = a.source_id
+            WHERE a.cluster_id = ANY($1::text[])
+        )
+        UPDATE clusters AS c
+        SET rep_article_id = ranked.id,
+            updated_at = NOW()
+        FROM ranked
+        WHERE ranked.rn = 1 AND c.id = ranked.cluster_id
         """
 
-        with get_cursor() as cursor:
-            cursor.execute(select_query, (cluster_id,))
-            row = cursor.fetchone()
-            if not row or not row.get("id"):
-                return
-
-            rep_id = row["id"]
-            update_query = """
-            UPDATE clusters
-            SET rep_article_id = %s,
-                updated_at = NOW()
-            WHERE id = %s
-            """
-            cursor.execute(update_query, (rep_id, cluster_id))
+        await execute_update(query, (list(cluster_ids),))
 
 
 if __name__ == "__main__":
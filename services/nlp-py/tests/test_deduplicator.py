@@ -0,0 +1,140 @@
+"""Tests for the hashing helpers in the deduplication worker."""
+
+import pytest
+import xxhash
+from datasketch import MinHash
+
+from src.workers import deduplicator
+
+TOKEN_LISTS = [
+    ["apple", "stock", "rises", "5", "on", "strong", "earnings"],
+    [],
+    ["market"],
+    ["the", "the", "the", "fed", "holds", "rates", "steady"],
+    [],
+    [f"token{i}" for i in range(300)],
+]
+
+BACKENDS = [
+    pytest.param(False, id="numpy"),
+    pytest.param(
+        True,
+        id="numba",
+        marks=pytest.mark.skipif(
+            deduplicator._simhash_kernel is None, reason="numba is not installed"
+        ),
+    ),
+]
+
+
+def reference_simhash(tokens: list[str], num_bits: int) -> str:
+    """Plain per-bit SimHash over the same token hashes."""
+    vector = [0] * num_bits
+    for token in tokens:
+        token_hash = xxhash.xxh3_64_intdigest(token.encode())
+        for i in range(num_bits):
+            vector[i] += 1 if token_hash >> i & 1 else -1
+
+    fingerprint = sum(1 << i for i in range(num_bits) if vector[i] > 0)
+    return format(fingerprint, f"0{num_bits // 4}x")
+
+
+@pytest.fixture
+def use_numba(request, monkeypatch):
+    """Select the SimHash backend under test."""
+    if not request.param:
+        monkeypatch.setattr(deduplicator, "_simhash_kernel", None)
+    return request.param
+
+
+@pytest.mark.parametrize("use_numba", BACKENDS, indirect=True)
+@pytest.mark.parametrize("num_bits", [8, 32, 64])
+def test_batch_simhash_matches_reference(use_numba, num_bits):
+    result = deduplicator.batch_simhash_from_tokens(TOKEN_LISTS, num_bits)
+
+    assert result == [reference_simhash(tokens, num_bits) for tokens in TOKEN_LISTS]
+
+
+@pytest.mark.parametrize("use_numba", BACKENDS, indirect=True)
+def test_batch_simhash_empty_token_lists_give_zero_hash(use_numba):
+    assert deduplicator.batch_simhash_from_tokens([[], []], 64) == ["0" * 16, "0" * 16]
+    assert deduplicator.batch_simhash_from_tokens([], 64) == []
+
+
+@pytest.mark.parametrize("use_numba", BACKENDS, indirect=True)
+def test_simhash_from_tokens_matches_batch(use_numba):
+    batch = deduplicator.batch_simhash_from_tokens(TOKEN_LISTS)
+
+    assert [deduplicator.simhash_from_tokens(tokens) for tokens in TOKEN_LISTS] == batch
+
+
+@pytest.mark.parametrize("num_bits", [0, 12, 72])
+def test_batch_simhash_rejects_invalid_num_bits(num_bits):
+    with pytest.raises(ValueError):
+        deduplicator.batch_simhash_from_tokens([["a"]], num_bits)
+
+
+def reference_hamming_distance(hash1: str, hash2: str) -> int:
+    """Bit-string comparison the XOR/popcount version replaced."""
+    bin1 = bin(int(hash1, 16))[2:].zfill(len(hash1) * 4)
+    bin2 = bin(int(hash2, 16))[2:].zfill(len(hash2) * 4)
+    return sum(b1 != b2 for b1, b2 in zip(bin1, bin2))
+
+
+HASH_PAIRS = [
+    ("0000000000000000", "0000000000000000"),
+    ("0000000000000000", "ffffffffffffffff"),
+    ("00000000000000ff", "000000000000000f"),
+    ("0f0f0f0f0f0f0f0f", "f0f0f0f0f0f0f0f0"),
+    ("94456805082048bc", "94456805082048bd"),
+    ("00ff", "0f00"),
+]
+
+
+@pytest.mark.parametrize("hash1, hash2", HASH_PAIRS)
+def test_hamming_distance_matches_reference(hash1, hash2):
+    assert deduplicator.hamming_distance(hash1, hash2) == reference_hamming_distance(hash1, hash2)
+
+
+def test_hamming_distance_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        deduplicator.hamming_distance("00ff", "000ff")
+
+
+def test_hamming_distances_matches_hamming_distance():
+    target, *_ = HASH_PAIRS[4]
+    hashes = [h for pair in HASH_PAIRS[:5] for h in pair]
+
+    distances = deduplicator.hamming_distances(target, hashes)
+
+    assert distances.tolist() == [deduplicator.hamming_distance(target, h) for h in hashes]
+
+
+def test_hamming_distances_rejects_length_mismatch():
+    with pytest.raises(ValueError):
+        deduplicator.hamming_distances("00ff", ["00ff", "000ff"])
+
+
+def test_hamming_distances_rejects_hashes_over_64_bits():
+    with pytest.raises(ValueError):
+        deduplicator.hamming_distances("0" * 32, ["0" * 32])
+
+
+@pytest.mark.parametrize("tokens", TOKEN_LISTS)
+def test_minhash_from_tokens_matches_per_token_update(tokens):
+    reference = MinHash(num_perm=128)
+    for token in tokens:
+        reference.update(token.encode("utf-8"))
+
+    minhash = deduplicator.minhash_from_tokens(tokens)
+
+    assert minhash.hashvalues.tolist() == reference.hashvalues.tolist()
+
+
+def test_batch_minhash_matches_single():
+    minhashes = deduplicator.batch_minhash_from_tokens(TOKEN_LISTS)
+
+    assert len(minhashes) == len(TOKEN_LISTS)
+    for tokens, minhash in zip(TOKEN_LISTS, minhashes):
+        expected = deduplicator.minhash_from_tokens(tokens)
+        assert minhash.hashvalues.tolist() == expected.hashvalues.tolist()
@@ -0,0 +1,50 @@
+"""Tests for job retry scheduling."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.lib import job_processor
+
+
+class NoopProcessor(job_processor.JobProcessor):
+    async def process_job(self, payload):
+        return {}
+
+
+@pytest.fixture
+def updates(monkeypatch):
+    calls = []
+
+    async def fake_execute_update(query, params=None):
+        calls.append((query, params))
+        return 1
+
+    monkeypatch.setattr(job_processor, "execute_update", fake_execute_update)
+    return calls
+
+
+@pytest.mark.parametrize("attempts", [2, 10])
+def test_fail_job_retry_backoff_within_jitter(updates, attempts):
+    processor = NoopProcessor("test")
+
+    asyncio.run(processor._fail_job("job-1", attempts, 20, "boom"))
+
+    ((query, (backoff, error, job_id)),) = updates
+    assert "status = 'pending'" in query
+    assert isinstance(backoff, timedelta)
+    assert (error, job_id) == ("boom", "job-1")
+    expected = timedelta(minutes=min(2 ** (attempts - 1), job_processor.MAX_BACKOFF_MINUTES))
+    assert expected * 0.8 <= backoff <= expected * 1.2
+
+
+@pytest.mark.parametrize("attempts", [3, 4])
+def test_fail_job_permanent_after_max_attempts(updates, attempts):
+    processor = NoopProcessor("test")
+
+    asyncio.run(processor._fail_job("job-1", attempts, 3, "boom"))
+
+    ((query, params),) = updates
+    assert "status = 'failed'" in query
+    assert params == ("boom", "job-1")
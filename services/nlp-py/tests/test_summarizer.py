@@ -0,0 +1,77 @@
+"""Regression tests for rule-based summarization."""
+
+import pytest
+
+from src.workers.summarizer import extract_numbers, generate_summary
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Revenue rose 12.3%", [("12.3%", "percentage")]),
+        ("Sales hit $1.5B", [("$1.5B", "currency")]),
+        ("Shipped 1,234,567 units", [("1,234,567", "number")]),
+        ("Priced at 3.45 each", [("3.45", "decimal")]),
+        (
+            "Filed 2024-01-15, reported Jan 5, 2024",
+            [("2024-01-15", "date"), ("Jan 5, 2024", "date")],
+        ),
+        (
+            "Revenue rose 12.3% to $1.5B",
+            [("12.3%", "percentage"), ("$1.5B", "currency")],
+        ),
+        ("No figures here", []),
+    ],
+)
+def test_extract_numbers(text, expected):
+    assert extract_numbers(text) == expected
+
+
+FED_SUMMARY_RAW = (
+    "The Federal Reserve left its benchmark rate unchanged at 5.25% on 2024-01-31, "
+    "citing progress on inflation. Officials signalled cuts could come later in the year."
+)
+
+
+# Expected outputs were produced by the per-pattern implementation this replaced
+@pytest.mark.parametrize(
+    "title, content, summary_raw, expected",
+    [
+        (
+            "Apple Stock Rises 5% on Strong Earnings",
+            (
+                "Apple Inc. reported quarterly revenue of $89.5B, up 12.3% from a year earlier. "
+                "Shares rose 5% in after-hours trading on Jan 30, 2024. The company said iPhone "
+                "sales of 1,234,567 units in China beat expectations. Analysts had expected a "
+                "smaller gain."
+            ),
+            None,
+            (
+                (
+                    "Apple Stock Rises 5% on Strong Earnings Apple Inc Shares rose 5% in "
+                    "after-hours trading on Jan 30, 2024"
+                ),
+                True,
+            ),
+        ),
+        (
+            "Fed holds rates steady",
+            None,
+            FED_SUMMARY_RAW,
+            # Splitting on "." breaks 5.25% into a "25%" that fails verification
+            (FED_SUMMARY_RAW, False),
+        ),
+        ("Markets quiet", None, "Short.", ("Short.", False)),
+        (
+            "Oil slips",
+            (
+                "Brent crude fell to $78.20 a barrel. Traders cited weaker demand from Asia as the "
+                "main reason for the decline in prices today."
+            ),
+            "Raw summary text",
+            ("Raw summary text", False),
+        ),
+    ],
+)
+def test_generate_summary(title, content, summary_raw, expected):
+    assert generate_summary(title, content, summary_raw) == expected